@@ -1,13 +1,46 @@
+import contextlib
+import functools
 import numpy as np
+import numba
 import math
-import random
+import multiprocessing
+import sys
+import types
+
+
+# (coefficient, b) pairs used by probability_catch_covid, keyed by (ismasked, isvent)
+_PARAMS = types.MappingProxyType({(False, False): (0.229814, 1.61), (True, False): (0.033230, 1.61),
+                                  (False, True): (0.034039, 10.87), (True, True): (0.004936, 10.87)})
+
+# number of runs simulated from one generator in _run_simulation_core, so results do not depend on the thread count
+_CHUNK_SIZE = 1024
+
+# number of runs _run_scenarios simulates at a time, only one block of samples is kept in memory
+_BLOCK_SIZE = 100_000
+
+# exp(-x) is 0 in double precision for every x above this
+_EXP_UNDERFLOW = 745.2
+
+# chance a person does not know they have covid (goes into office)
+QUARANTINE_CHANCE = 0.4
+
+# (table column, description, run_simulation_batch options) for every set of mitigation strategies compared,
+# p_mult scales the outside infection rate
+SCENARIOS = [("No Measures", "when no mitigation strategies are used", {}),
+             ("Masking Only", "when masks are used in the office", {"ismasked": True}),
+             ("Ventilation Only", "when the office uses good ventilation systems", {"isvent": True}),
+             ("Quarantine", "when the office encourages quarantining when an employee is feeling symptoms", {"p_mult": QUARANTINE_CHANCE}),
+             ("All Measures", "when the office uses all mentioned mitigation strategies", {"ismasked": True, "isvent": True, "p_mult": QUARANTINE_CHANCE})]
+
+# rows of Pascal's triangle already built by _pascal_row, keyed by n
+_PASCAL_ROWS = {}
 
 
 """
 Generates the probability a person would catch covid given
 - num_infected: the number of people infected
 - office_volume: the area in the office
-- time_in_office: the amount of time a person spends in the office
+- time_in_office: the amount of time a person spends in the office (a single value or an array of values)
 - ismasked: if the office is masked or not
 - isvent: if the office is well ventilated (hepa filters/good mechanical system)
 ismasked, and isvent default to false (no mitigation measures taken)
@@ -16,33 +49,70 @@ These numbers are from https://www.ncbi.nlm.nih.gov/pmc/articles/PMC7474922/
 def probability_catch_covid(num_infected, office_volume, time_in_office, ismasked=False, isvent=False):
     if num_infected == 0:
         return 0
-    a = num_infected/office_volume
-    b = 1.61
-    if ismasked and isvent:
-        a *= 0.004936
-        b = 10.87
-    elif ismasked:
-        a *= 0.033230
-        b = 1.61
-    elif isvent:
-        a *= 0.034039
-        b = 10.87
-    else:
-        a *= 0.229814
-        b = 1.61
-    d_q = 0.49 * (a*time_in_office - a/b + (a/b)*math.exp(-b*time_in_office))
-    return 1 - math.exp(-d_q)
+    coef, b = _PARAMS[(bool(ismasked), bool(isvent))]
+    a = coef*num_infected/office_volume
+    return _probability_catch_covid(a, b, time_in_office)
+
+
+"""
+Same as probability_catch_covid, but takes the already scaled constants
+- a: the scenario coefficient times num_infected/office_volume
+- b: the scenario decay constant
+so the simulation can resolve them once instead of for every employee
+Compiled as a ufunc, so it takes single values or arrays
+"""
+@numba.vectorize(cache=True, fastmath=True)
+def _probability_catch_covid(a, b, time_in_office):
+    bt = b*time_in_office
+    # exp(-bt) is exactly 0 past _EXP_UNDERFLOW, so skip evaluating it there. With b = 10.87 that is any shift over
+    # about 69 minutes, but with b = 1.61 only shifts of about 463 minutes or more, a small share of typical draws
+    decay = math.exp(-bt) if bt < _EXP_UNDERFLOW else 0.0
+    d_q = 0.49 * (a*time_in_office - (a/b)*(1 - decay))
+    return -math.expm1(-d_q)  # 1 - exp(-d_q), without the cancellation when d_q is small
 
 
 """
 Generates a random variate to represent how long a person spends in the office given
 - average_shift: the average shift length in minutes
 - standard_dev: the standard deviation in amount of time spend in the office
+- size: the number of variates to generate, if None a single value is returned
+- rng: the numpy Generator to draw from, if None a new unseeded one is created
 This is assumed to be a standard normal distribution
 If no values are given, default values of 8 hours per day and a 15 minute standard deviation are used
+This is a standalone helper, the simulation draws its shift times inside _run_simulation_core instead.
+Pass rng to get reproducible draws, np.random.seed has no effect on it
 """
-def rv_time_in_office(average_shift=480, standard_dev=15):
-    return np.random.normal(average_shift, standard_dev)
+def rv_time_in_office(average_shift=480, standard_dev=15, size=None, rng=None):
+    if rng is None:
+        rng = np.random.default_rng()
+    return rng.normal(average_shift, standard_dev, size)
+
+
+"""
+Returns row n of Pascal's triangle, so that _pascal_row(n)[k] is n choose k
+Rows are built once with O(n) integer operations and kept in _PASCAL_ROWS
+"""
+def _pascal_row(n):
+    if n not in _PASCAL_ROWS:
+        row = [1]*(n+1)
+        for i in range(1, n+1):
+            row[i] = row[i-1]*(n-i+1)//i
+        _PASCAL_ROWS[n] = row
+    return _PASCAL_ROWS[n]
+
+
+"""
+Returns the weight given to the runs where k = 1..n people came into the office with covid given
+- n: the number of people in the office
+- p: the outside infection rate
+These only depend on n and p, so they are cached and shared by every simulation of a scenario
+"""
+@functools.lru_cache(maxsize=None)
+def _binomial_weights(n, p):
+    ks = np.arange(1, n+1)
+    weights = np.array(_pascal_row(n)[1:], dtype=float)*(p**ks)*((1-p)**ks)  # binomial distribution
+    weights.setflags(write=False)
+    return weights
 
 
 """
@@ -53,38 +123,199 @@ Runs a simulation to generate the number of employees who would be infected afte
 - ismasked: if the office is masked or not
 - isvent: if the office is well ventilated (hepa filters/good mechanical system)
 - run_as_one: if true, run as if exactly one person in the office has covid
+- rng: the numpy Generator to draw from, if None a new unseeded one is created
 outside_infection_rate has a default of 0.0015, which is the current rate of covid in adults in the united states
 ismasked, and isvent default to false (no mitigation measures taken)
 run_as_one defaults to false (run with current infection rates)
 """
-def run_simulation(num_in_office, office_volume, outside_infection_rate=0.0015, ismasked=False, isvent=False, run_as_one=False, ave_shift=480, standard_dev=15):
+def run_simulation(num_in_office, office_volume, outside_infection_rate=0.0015, ismasked=False, isvent=False, run_as_one=False, ave_shift=480, standard_dev=15, rng=None):
+    return run_simulation_batch(1, num_in_office, office_volume, outside_infection_rate, ismasked, isvent, run_as_one, ave_shift, standard_dev, rng)[0]
+
+
+"""
+Runs number_of_runs independent simulations at once and returns an array holding the number of employees infected
+in each run. Takes the same parameters as run_simulation, plus
+- number_of_runs: the number of simulations (workdays) to run
+- processes: the number of worker processes to split the runs across
+processes defaults to 1 (all runs in this process, spread across threads by numba)
+Workers are started with spawn rather than fork, since forking after numba's thread pool has started can deadlock,
+so a script that uses processes > 1 must guard its entry point with if __name__ == '__main__'
+"""
+def run_simulation_batch(number_of_runs, num_in_office, office_volume, outside_infection_rate=0.0015, ismasked=False, isvent=False, run_as_one=False, ave_shift=480, standard_dev=15, rng=None, processes=1):
+    scenarios = [{"ismasked": ismasked, "isvent": isvent}]
+    return run_scenarios_batch(number_of_runs, num_in_office, office_volume, scenarios, outside_infection_rate, run_as_one, ave_shift, standard_dev, rng, processes)[:, 0]
+
+
+"""
+Runs number_of_runs simulations of several scenarios at once and returns a (number_of_runs, len(scenarios)) array
+holding the number of employees infected in each run of each scenario given
+- scenarios: a list of dicts with the options of each scenario, as in SCENARIOS
+  (ismasked, isvent, and p_mult which scales outside_infection_rate, all optional)
+- pool: a pool from _worker_pool to reuse when processes > 1, if None one is started for this call
+The other parameters are the same as run_simulation_batch.
+Every scenario sees the same shift times and uniform draws, so the random variates are generated once per run
+instead of once per scenario. Runs stay independent of each other, but the columns of one run are correlated.
+The runs are simulated by the compiled _run_simulation_core, seeded from rng.
+"""
+def run_scenarios_batch(number_of_runs, num_in_office, office_volume, scenarios, outside_infection_rate=0.0015, run_as_one=False, ave_shift=480, standard_dev=15, rng=None, processes=1, pool=None):
+    if rng is None:
+        rng = np.random.default_rng()
+    if number_of_runs == 0:
+        return np.zeros((0, len(scenarios)), dtype=np.int32 if run_as_one else float)  # same dtypes as the branches below
+    if processes > 1:
+        chunk_sizes = [number_of_runs//processes + (i < number_of_runs % processes) for i in range(processes)]
+        chunk_sizes = [chunk_size for chunk_size in chunk_sizes if chunk_size > 0]  # fewer runs than processes
+        seeds = rng.integers(2**63, size=len(chunk_sizes))
+        params = (num_in_office, office_volume, scenarios, outside_infection_rate, run_as_one, ave_shift, standard_dev)
+        with contextlib.nullcontext(pool) if pool is not None else _worker_pool(len(chunk_sizes)) as workers:
+            parts = workers.map(_run_simulation_chunk, [(chunk_size, seed, params) for chunk_size, seed in zip(chunk_sizes, seeds)])
+        return np.concatenate(parts)
+    coefs, bs = np.array([_PARAMS[(bool(options.get("ismasked", False)), bool(options.get("isvent", False)))] for options in scenarios]).T
+    rngs = _chunk_generators(number_of_runs, rng)  # shared by every core call below, each call advances their states
     if run_as_one:
-        number_infected_in_office = 0
-        for i in range(num_in_office):
-            time_in_office = rv_time_in_office(ave_shift, standard_dev)
-            if random.random() <= probability_catch_covid(1, office_volume, time_in_office, ismasked, isvent):
-                number_infected_in_office += 1
-        return number_infected_in_office
+        a0s = coefs/office_volume
+        return _run_simulation_core(num_in_office, a0s, bs, ave_shift, standard_dev, number_of_runs, rngs)
     else:
-        expected_number_infected = 0
-        for i in range(num_in_office):
-            k = i+1
-            n = num_in_office
-            p = outside_infection_rate
-            probability = math.comb(n,k)*(p**k)*((1-p)**k)  # binomial distribution
-            number_infected_in_office = 0
-            for j in range(num_in_office-k):
-                time_in_office = rv_time_in_office(ave_shift, standard_dev)
-                if random.random() <= probability_catch_covid(k, office_volume, time_in_office, ismasked, isvent):
-                    number_infected_in_office += 1
-            expected_number_infected += probability*number_infected_in_office
+        expected_number_infected = np.zeros((number_of_runs, len(scenarios)))
+        weighted = np.empty((number_of_runs, len(scenarios)))
+        n = num_in_office
+        rates = [outside_infection_rate*options.get("p_mult", 1) for options in scenarios]
+        probabilities = np.array([_binomial_weights(n, p) for p in rates]).T  # row k-1 holds the weight of k for each scenario
+        for k, probability in zip(range(1, n+1), probabilities):
+            if not probability.any() or k == n:
+                continue  # nothing to add when every weight is 0 or nobody is left to infect
+            a0s = coefs*k/office_volume
+            number_infected_in_office = _run_simulation_core(num_in_office-k, a0s, bs, ave_shift, standard_dev, number_of_runs, rngs)
+            np.multiply(number_infected_in_office, probability, out=weighted)
+            expected_number_infected += weighted
         return expected_number_infected
 
 
+"""
+Starts a pool of processes workers for run_scenarios_batch, each running numba single threaded so the workers do not
+oversubscribe the cores. Workers are spawned rather than forked, see run_simulation_batch
+"""
+def _worker_pool(processes):
+    return multiprocessing.get_context("spawn").Pool(processes, initializer=numba.set_num_threads, initargs=(1,))
+
+
+"""
+Worker for run_scenarios_batch when processes > 1, runs one chunk of the runs given
+- args: (number_of_runs, seed, params) where params are the positional arguments of run_scenarios_batch after number_of_runs
+Each worker gets its own seed so the chunks are independent and the result is reproducible
+"""
+def _run_simulation_chunk(args):
+    number_of_runs, seed, params = args
+    return run_scenarios_batch(number_of_runs, *params, rng=np.random.default_rng(seed))
+
+
+"""
+Returns one independent PCG64DXSM Generator for every chunk of _CHUNK_SIZE runs in n_runs, seeded from rng
+so each prange thread in _run_simulation_core draws from its own state
+"""
+def _chunk_generators(n_runs, rng):
+    n_chunks = (n_runs + _CHUNK_SIZE - 1) // _CHUNK_SIZE
+    seeds = np.random.SeedSequence(rng.integers(2**63)).spawn(n_chunks)
+    return numba.typed.List([np.random.Generator(np.random.PCG64DXSM(seed)) for seed in seeds])
+
+
+"""
+Compiled body of run_scenarios_batch, returns an (n_runs, len(a0s)) int32 array of the number of employees infected
+in each run of each scenario given
+- num_in_office: the number of employees who can catch covid
+- a0s, bs: the scaled constants passed to _probability_catch_covid, one pair per scenario
+- ave_shift, standard_dev: the parameters of the shift length distribution
+- n_runs: the number of runs to simulate
+- rngs: one numpy Generator per chunk of _CHUNK_SIZE runs, from _chunk_generators
+Runs are independent, so chunks of them are spread across threads with prange. Each employee's shift time and
+uniform are drawn once and compared against the probability of every scenario in one pass, without building
+intermediate arrays
+"""
+@numba.njit(cache=True, fastmath=True, parallel=True)
+def _run_simulation_core(num_in_office, a0s, bs, ave_shift, standard_dev, n_runs, rngs):
+    number_infected = np.zeros((n_runs, len(a0s)), dtype=np.int32)
+    for c in numba.prange(len(rngs)):
+        rng = rngs[np.int64(c)]  # prange indices are unsigned, typed lists expect a signed index
+        for r in range(c*_CHUNK_SIZE, min(n_runs, (c+1)*_CHUNK_SIZE)):
+            for j in range(num_in_office):
+                # Generator.standard_normal (ziggurat) compiles inline and is several times faster than Box-Muller
+                time_in_office = ave_shift + standard_dev*rng.standard_normal()
+                u = rng.random()
+                for s in range(len(a0s)):
+                    if u <= _probability_catch_covid(a0s[s], bs[s], time_in_office):
+                        number_infected[r, s] += 1
+    return number_infected
+
+
+"""
+Folds a block of samples into the running statistics of Welford's algorithm given
+- count, mean, m2: the number of samples so far, their mean and their sum of squared differences from the mean
+- samples: the new block of samples, with one column per statistic when mean and m2 are arrays
+Returns the updated (count, mean, m2), the population standard deviation is sqrt(m2/count)
+Blocks are merged with the pairwise update of Chan et al., which is exact for any block size
+"""
+def _welford_update(count, mean, m2, samples):
+    block_count = samples.shape[0]
+    block_mean = samples.mean(axis=0)
+    block_m2 = ((samples - block_mean)**2).sum(axis=0)
+    total = count + block_count
+    delta = block_mean - mean
+    mean += delta*block_count/total
+    m2 += block_m2 + delta**2*count*block_count/total
+    return total, mean, m2
+
+
+"""
+Runs every scenario in SCENARIOS, prints the expected number of infections for each, and returns a dict mapping
+the table column of each scenario to its (mean, standard deviation). Takes the parameters of main_allnumbers plus
+- run_as_one: passed on to run_scenarios_batch
+- number_of_runs: the number of simulations to run per scenario
+All scenarios are simulated together by run_scenarios_batch, so they share their random draws. Runs are simulated
+in blocks of _BLOCK_SIZE and folded into a running mean and M2 with _welford_update, so memory does not grow with
+number_of_runs. When processes > 1, one worker pool is started up front and shared by every block
+"""
+def _run_scenarios(num_in_office, office_volume, outside_infection_rate, average_shift, standard_dev, run_as_one, number_of_runs, rng, processes):
+    scenarios = [options for column, description, options in SCENARIOS]
+    count, mean, m2 = 0, np.zeros(len(scenarios)), np.zeros(len(scenarios))
+    with _worker_pool(processes) if processes > 1 else contextlib.nullcontext() as pool:
+        for start in range(0, number_of_runs, _BLOCK_SIZE):
+            samples = run_scenarios_batch(min(_BLOCK_SIZE, number_of_runs - start), num_in_office, office_volume, scenarios, outside_infection_rate,
+                                          run_as_one, average_shift, standard_dev, rng, processes, pool)
+            count, mean, m2 = _welford_update(count, mean, m2, samples)
+    results = {}
+    for i, (column, description, options) in enumerate(SCENARIOS):
+        results[column] = (mean[i], math.sqrt(m2[i]/count))
+        print("The expected number of people with covid after one day in office is " + str(results[column][0]) + " " + description + ".")
+    return results
+
+
+"""
+Prints the results returned by _run_scenarios as a LaTeX table
+"""
+def _print_latex_table(results, number_of_runs):
+    columns = " & ".join(results)
+    means = " & ".join(f"{round(mean,8)}" for mean, std in results.values())
+    stds = " & ".join(f"{round(std,8)}" for mean, std in results.values())
+    confidence = " & ".join(f"{round(mean,4)}\\pm {round(std*1.96/math.sqrt(number_of_runs),4)}" for mean, std in results.values())
+    sys.stdout.write(f"""LaTeX Table Form
+\\hline
+ & {columns}
+\\hline\\hline
+Mean & {means}
+\\hline
+Standard Deviation & {stds}
+\\hline
+95% Confidence & {confidence}
+\\hline
+""")
+
+
 """
 Main function, starts simulation according to preferences
 """
-def main_allnumbers(num_in_office, office_volume, outside_infection_rate=0.0015, average_shift=480, standard_dev=15):
+def main_allnumbers(num_in_office, office_volume, outside_infection_rate=0.0015, average_shift=480, standard_dev=15, rng=None, processes=1):
+    if rng is None:
+        rng = np.random.default_rng()
     print("Given that: ")
     print("The number of people in the office is " + str(num_in_office))
     print("The area of the office is " + str(office_volume))
@@ -94,60 +325,12 @@ def main_allnumbers(num_in_office, office_volume, outside_infection_rate=0.0015,
 
     number_of_runs = 10000
 
-    without_measures = []
-    for i in range(number_of_runs):
-        without_measures += [run_simulation(num_in_office, office_volume, outside_infection_rate, ave_shift=average_shift, standard_dev=standard_dev)]
-    without_measures_mean = np.mean(without_measures)
-    without_measures_std = np.std(without_measures)
-    print("The expected number of people with covid after one day in office is " + str(without_measures_mean) + " when no mitigation strategies are used.")
-
-    masking = []
-    for i in range(number_of_runs):
-        masking += [run_simulation(num_in_office, office_volume, outside_infection_rate, ismasked=True, ave_shift=average_shift, standard_dev=standard_dev)]
-    masking_mean = np.mean(masking)
-    masking_std = np.std(masking)
-    print("The expected number of people with covid after one day in office is " + str(masking_mean) + " when masks are used in the office.")
-
-    ventilation = []
-    for i in range(number_of_runs):
-        ventilation += [run_simulation(num_in_office, office_volume, outside_infection_rate, isvent=True, ave_shift=average_shift, standard_dev=standard_dev)]
-    ventilation_mean = np.mean(ventilation)
-    ventilation_std = np.std(ventilation)
-    print("The expected number of people with covid after one day in office is " + str(ventilation_mean) + " when the office uses good ventilation systems.")
-
-    chance = 0.4 # chance a person does not know they have covid (goes into office)
-    quarantine = []
-    for i in range(number_of_runs):
-        quarantine += [run_simulation(num_in_office, office_volume, outside_infection_rate * chance, ave_shift=average_shift, standard_dev=standard_dev)]
-    quarantine_mean = np.mean(quarantine)
-    quarantine_std = np.std(quarantine)
-    print("The expected number of people with covid after one day in office is " + str(quarantine_mean) + " when the office encourages quarantining when an employee is feeling symptoms.")
-
-    all_measures = []
-    for i in range(number_of_runs):
-        all_measures += [run_simulation(num_in_office, office_volume, outside_infection_rate * chance, True, True, False, average_shift, standard_dev)]
-    all_measures_mean = np.mean(all_measures)
-    all_measures_std = np.std(all_measures)
-    print("The expected number of people with covid after one day in office is " + str(all_measures_mean) + " when the office uses all mentioned mitigation strategies.")
-
-
-    print("LaTeX Table Form")
-    print("\hline")
-    print(" & No Measures & Masking Only & Ventilation Only & Quarantine & All Measures")
-    print("\hline\hline")
-    print("Mean & " + str(round(without_measures_mean,8)) + " & " + str(round(masking_mean,8)) + " & " + str(round(ventilation_mean,8)) + " & " + str(round(quarantine_mean,8)) + " & " + str(round(all_measures_mean,8)))
-    print("\hline")
-    print("Standard Deviation & " + str(round(without_measures_std,8)) + " & " + str(round(masking_std,8)) + " & " + str(round(
-        ventilation_std,8)) + " & " + str(round(quarantine_std,8)) + " & " + str(round(all_measures_std,8)))
-    print("\hline")
-    print("95% Confidence & " + str(round(without_measures_mean,4)) + "\pm " + str(round((without_measures_std*1.96/math.sqrt(number_of_runs)),4))
-          + " & " + str(round(masking_mean,4)) + "\pm " + str(round((masking_std*1.96/math.sqrt(number_of_runs)),4)) + " & " + str(round(ventilation_mean,4))
-          + "\pm " + str(round((ventilation_std*1.96/math.sqrt(number_of_runs)),4)) + " & " + str(round(quarantine_mean,4)) + "\pm "
-          + str(round((quarantine_std*1.96/math.sqrt(number_of_runs)),4)) + " & " + str(round(all_measures_mean,4)) + "\pm "
-          + str(round((all_measures_std*1.96/math.sqrt(number_of_runs)),4)))
-    print("\hline")
-
-def main_runasone(num_in_office, office_volume, outside_infection_rate=0.0015, average_shift=480, standard_dev=15):
+    results = _run_scenarios(num_in_office, office_volume, outside_infection_rate, average_shift, standard_dev, False, number_of_runs, rng, processes)
+    _print_latex_table(results, number_of_runs)
+
+def main_runasone(num_in_office, office_volume, outside_infection_rate=0.0015, average_shift=480, standard_dev=15, rng=None, processes=1):
+    if rng is None:
+        rng = np.random.default_rng()
     print("Given that: ")
     print("The number of people in the office is " + str(num_in_office))
     print("The area of the office is " + str(office_volume))
@@ -159,66 +342,8 @@ def main_runasone(num_in_office, office_volume, outside_infection_rate=0.0015, a
 
     print("Here are the numbers when the simulation is run with exactly one person coming into the office with covid: ")
 
-    without_measures = []
-    for i in range(number_of_runs):
-        without_measures += [run_simulation(num_in_office, office_volume, outside_infection_rate, run_as_one=True, ave_shift=average_shift, standard_dev=standard_dev)]
-    without_measures_mean = np.mean(without_measures)
-    without_measures_std = np.std(without_measures)
-    print("The expected number of people with covid after one day in office is " + str(
-        without_measures_mean) + " when no mitigation strategies are used.")
-
-    masking = []
-    for i in range(number_of_runs):
-        masking += [run_simulation(num_in_office, office_volume, outside_infection_rate, ismasked=True, run_as_one=True, ave_shift=average_shift, standard_dev=standard_dev)]
-    masking_mean = np.mean(masking)
-    masking_std = np.std(masking)
-    print("The expected number of people with covid after one day in office is " + str(
-        masking_mean) + " when masks are used in the office.")
-
-    ventilation = []
-    for i in range(number_of_runs):
-        ventilation += [run_simulation(num_in_office, office_volume, outside_infection_rate, isvent=True, run_as_one=True, ave_shift=average_shift, standard_dev=standard_dev)]
-    ventilation_mean = np.mean(ventilation)
-    ventilation_std = np.std(ventilation)
-    print("The expected number of people with covid after one day in office is " + str(
-        ventilation_mean) + " when the office uses good ventilation systems.")
-
-    chance = 0.4  # chance a person does not know they have covid (goes into office)
-    quarantine = []
-    for i in range(number_of_runs):
-        quarantine += [run_simulation(num_in_office, office_volume, outside_infection_rate * chance, run_as_one=True, ave_shift=average_shift, standard_dev=standard_dev)]
-    quarantine_mean = np.mean(quarantine)
-    quarantine_std = np.std(quarantine)
-    print("The expected number of people with covid after one day in office is " + str(
-        quarantine_mean) + " when the office encourages quarantining when an employee is feeling symptoms.")
-
-    all_measures = []
-    for i in range(number_of_runs):
-        all_measures += [run_simulation(num_in_office, office_volume, outside_infection_rate * chance, True, True, True, average_shift, standard_dev)]
-    all_measures_mean = np.mean(all_measures)
-    all_measures_std = np.std(all_measures)
-    print("The expected number of people with covid after one day in office is " + str(
-        all_measures_mean) + " when the office uses all mentioned mitigation strategies.")
-
-    print("LaTeX Table Form")
-    print("\hline")
-    print(" & No Measures & Masking Only & Ventilation Only & Quarantine & All Measures")
-    print("\hline\hline")
-    print("Mean & " + str(round(without_measures_mean,8)) + " & " + str(round(masking_mean,8)) + " & " + str(round(
-        ventilation_mean,8)) + " & " + str(round(quarantine_mean,8)) + " & " + str(round(all_measures_mean,8)))
-    print("\hline")
-    print("Standard Deviation & " + str(round(without_measures_std,8)) + " & " + str(round(masking_std,8)) + " & " + str(round(
-        ventilation_std,8)) + " & " + str(round(quarantine_std,8)) + " & " + str(round(all_measures_std,8)))
-    print("\hline")
-    print("95% Confidence & " + str(round(without_measures_mean, 4)) + "\pm " + str(
-        round((without_measures_std * 1.96 / math.sqrt(number_of_runs)), 4)) + " & " + str(
-        round(masking_mean, 4)) + "\pm " + str(round((masking_std * 1.96 / math.sqrt(number_of_runs)), 4)) + " & " + str(
-        round(ventilation_mean, 4)) + "\pm " + str(
-        round((ventilation_std * 1.96 / math.sqrt(number_of_runs)), 4)) + " & " + str(
-        round(quarantine_mean, 4)) + "\pm " + str(
-        round((quarantine_std * 1.96 / math.sqrt(number_of_runs)), 4)) + " & " + str(
-        round(all_measures_mean, 4)) + "\pm " + str(round((all_measures_std * 1.96 / math.sqrt(number_of_runs)), 4)))
-    print("\hline")
+    results = _run_scenarios(num_in_office, office_volume, outside_infection_rate, average_shift, standard_dev, True, number_of_runs, rng, processes)
+    _print_latex_table(results, number_of_runs)
 
 
 """
@@ -235,8 +360,11 @@ def main():
     outside_infection_rate = 0.0015
     average_shift = 433.578
     standard_dev = 20.32
-    main_allnumbers(num_in_office, office_volume, outside_infection_rate, average_shift, standard_dev)
-    main_runasone(num_in_office, office_volume, outside_infection_rate, average_shift, standard_dev)
+    seed = None  # set to an integer to get reproducible results
+    processes = 1  # set above 1 to split the runs of each scenario across that many worker processes
+    rng = np.random.default_rng(seed)
+    main_allnumbers(num_in_office, office_volume, outside_infection_rate, average_shift, standard_dev, rng, processes)
+    main_runasone(num_in_office, office_volume, outside_infection_rate, average_shift, standard_dev, rng, processes)
 
 
 